@@ -6,15 +6,18 @@ management system. It converts human-readable queries like "show me female
 users named Taylor" into structured database filters.
 
 Architecture:
-    User Query -> AI Parsing (Ollama LLM) -> SQL Filters
+    User Query -> Query Cache -> AI Parsing (Ollama LLM) -> SQL Filters
 
-All queries are processed directly by the AI (Ollama LLM) which converts
-natural language into structured filters. The AI handles synonyms,
-abbreviations, typos, and complex query patterns.
+Queries are processed by the AI (Ollama LLM), which converts natural
+language into structured filters. The AI handles synonyms, abbreviations,
+typos, and complex query patterns. Bare names ("Adam", "J") are answered
+without the AI, and successful parses are cached in memory so repeated
+queries skip the AI call.
 
 Modules:
     - models: Pydantic data models (UserRecord, UserQueryFilters, FilteredResult)
     - llm: LLM integration with Ollama API
+    - cache: In-memory cache of parsed queries
     - query_parser: AI-based query parsing
     - db_queries: Database query functions
 
@@ -22,10 +25,12 @@ Main exports:
     - filter_records_ai: Main search function
     - chat_completion: Direct LLM chat
     - close_http_client: Cleanup function
+    - clear_cache: Drop all cached query parses
 """
 
 # Re-export main functions
 from ai.llm import chat_completion, close_http_client, warmup_model
+from ai.cache import clear_cache, get_cache_stats
 from ai.db_queries import filter_records_ai
 from ai.models import UserRecord, UserQueryFilters, FilteredResult
 from ai.query_parser import parse_query_ai
@@ -38,6 +43,9 @@ __all__ = [
     # Lifecycle
     "close_http_client",
     "warmup_model",
+    # Cache
+    "clear_cache",
+    "get_cache_stats",
     # Models
     "UserRecord",
     "UserQueryFilters",
@@ -0,0 +1,81 @@
+"""
+ai/cache.py - In-Memory Cache for Parsed Queries
+
+The LLM call is by far the slowest step of an AI search (hundreds of
+milliseconds to several seconds). The mapping from query text to filters
+does not depend on database contents, and the model runs at temperature
+0, so a parsed query can safely be reused. Caching UserQueryFilters by
+normalized query lets repeated searches (pagination, refreshes, popular
+queries) skip the AI round-trip entirely.
+
+Only successful parses are cached. Fallback filters returned after a
+timeout or service error are transient and are never stored.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+from ai.models import UserQueryFilters
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of parsed queries kept in memory
+CACHE_MAX_SIZE = 1000
+
+# Least-recently-used entries sit at the front, most recent at the end
+_query_cache: "OrderedDict[str, UserQueryFilters]" = OrderedDict()
+
+
+def get_cached_query(key: str) -> Optional[UserQueryFilters]:
+    """
+    Look up previously parsed filters for a normalized query.
+
+    A hit marks the entry as most recently used.
+
+    Args:
+        key: Normalized query string
+
+    Returns:
+        The cached filters (frozen, safe to share), or None on a cache miss
+    """
+    cached = _query_cache.get(key)
+    if cached is None:
+        return None
+    _query_cache.move_to_end(key)
+    return cached
+
+
+def cache_query(key: str, filters: UserQueryFilters) -> None:
+    """
+    Store parsed filters for a normalized query.
+
+    When the cache is full the least recently used entry is evicted.
+
+    Args:
+        key: Normalized query string
+        filters: Successfully parsed filters
+    """
+    _query_cache[key] = filters
+    _query_cache.move_to_end(key)
+    if len(_query_cache) > CACHE_MAX_SIZE:
+        _query_cache.popitem(last=False)
+
+
+def clear_cache() -> None:
+    """Remove all cached queries."""
+    _query_cache.clear()
+    logger.info("Query cache cleared")
+
+
+def get_cache_stats() -> dict:
+    """
+    Get current cache statistics.
+
+    Returns:
+        dict: Number of cached queries and the configured maximum
+    """
+    return {
+        "size": len(_query_cache),
+        "max_size": CACHE_MAX_SIZE,
+    }
@@ -15,8 +15,9 @@ import logging
 from typing import List, Optional
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, desc, asc
 
+import models
 from ai.models import UserRecord, UserQueryFilters, FilteredResult
 from ai.query_parser import parse_query_ai
 
@@ -28,14 +29,13 @@ logger = logging.getLogger(__name__)
 # ==============================================================================
 
 
-def _apply_filters(query, filters: UserQueryFilters, models):
+def _apply_filters(query, filters: UserQueryFilters):
     """
     Apply all filters to the SQLAlchemy query.
 
     Args:
         query: SQLAlchemy query object
         filters: Parsed query filters
-        models: Models module reference
 
     Returns:
         Modified query with filters applied
@@ -49,10 +49,8 @@ def _apply_filters(query, filters: UserQueryFilters, models):
         query = query.filter(models.User.full_name.ilike(pattern))
 
     if filters.name_length_parity:
-        name_without_spaces = func.replace(models.User.full_name, ' ', '')
-        name_length = func.length(name_without_spaces)
         remainder = 1 if filters.name_length_parity == "odd" else 0
-        query = query.filter(name_length % 2 == remainder)
+        query = query.filter(models.User.name_length % 2 == remainder)
 
     if filters.has_profile_pic is True:
         query = query.filter(models.User.profile_pic.isnot(None))
@@ -65,14 +63,24 @@ def _apply_filters(query, filters: UserQueryFilters, models):
     return query
 
 
-def _apply_sorting(query, filters: UserQueryFilters, models):
+# Sortable columns. The expressions don't depend on the request, so they
+# are built once at import and reused for every query.
+_SORT_COLUMNS = {
+    "name_length": models.User.name_length,
+    "username_length": func.length(models.User.username),
+    "name": models.User.full_name,
+    "username": models.User.username,
+    "created_at": models.User.created_at,
+}
+
+
+def _apply_sorting(query, filters: UserQueryFilters):
     """
     Apply sorting to the SQLAlchemy query.
 
     Args:
         query: SQLAlchemy query object
         filters: Parsed query filters
-        models: Models module reference
 
     Returns:
         Modified query with sorting applied
@@ -80,19 +88,9 @@ def _apply_sorting(query, filters: UserQueryFilters, models):
     if not filters.sort_by:
         return query
 
-    from sqlalchemy import desc, asc
-    order_func = desc if filters.sort_order == "desc" else asc
-
-    sort_columns = {
-        "name_length": func.length(func.replace(models.User.full_name, ' ', '')),
-        "username_length": func.length(models.User.username),
-        "name": models.User.full_name,
-        "username": models.User.username,
-        "created_at": models.User.created_at,
-    }
-
-    column = sort_columns.get(filters.sort_by)
+    column = _SORT_COLUMNS.get(filters.sort_by)
     if column is not None:
+        order_func = desc if filters.sort_order == "desc" else asc
         query = query.order_by(order_func(column))
 
     return query
@@ -116,39 +114,55 @@ def query_users(db: Session, filters: UserQueryFilters, limit: int = 20, skip: i
     Returns:
         Tuple of (List of UserRecord objects, total count of matching records)
     """
-    import models
-
-    query = db.query(models.User)
-    query = _apply_filters(query, filters, models)
-    query = _apply_sorting(query, filters, models)
+    # Select only the columns UserRecord needs (no password hash, timestamps
+    # or ORM identity-map bookkeeping). count(*) OVER () attaches the total
+    # number of matches (computed before LIMIT/OFFSET) to every row, so one
+    # round-trip returns page and total
+    query = db.query(
+        models.User.id,
+        models.User.full_name,
+        models.User.username,
+        models.User.gender,
+        models.User.profile_pic,
+        func.count().over().label("total_count"),
+    )
+    query = _apply_filters(query, filters)
+    query = _apply_sorting(query, filters)
 
-    logger.debug("Query filters: %s", filters.model_dump())
+    # model_dump() builds a dict, so only pay for it when debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Query filters: %s", filters.model_dump())
 
     try:
-        # Get total count BEFORE applying limit/offset
-        total_count = query.count()
+        rows = query.offset(skip).limit(limit).all()
 
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
+        if rows:
+            total_count = rows[0].total_count
+        elif skip > 0:
+            # Page past the end: no rows to carry the window count
+            total_count = _apply_filters(db.query(models.User.id), filters).count()
+        else:
+            total_count = 0
 
-        results = query.all()
-        logger.info(f"Found {len(results)} users (total matching: {total_count})")
+        logger.info("Found %d users (total matching: %d)", len(rows), total_count)
 
+        # Rows were validated when written (model validators, NOT NULL and
+        # CHECK constraints), so skip Pydantic re-validation per record
         user_records = [
-            UserRecord(
-                id=user.id,
-                full_name=user.full_name,
-                username=user.username,
-                gender=user.gender,
-                profile_pic=user.profile_pic
+            UserRecord.model_construct(
+                id=row.id,
+                full_name=row.full_name,
+                username=row.username,
+                gender=row.gender,
+                profile_pic=row.profile_pic
             )
-            for user in results
+            for row in rows
         ]
 
         return user_records, total_count
 
     except Exception as exc:
-        logger.error(f"Database error querying users: {exc}")
+        logger.error("Database error querying users: %s", exc)
         raise
 
 
@@ -157,24 +171,40 @@ def query_users(db: Session, filters: UserQueryFilters, limit: int = 20, skip: i
 # ==============================================================================
 
 
-def _format_sort_label(sort_by: str, sort_order: str) -> str:
-    """Format sort criteria into human-readable label."""
-    sort_labels = {
-        "name_length": "name length",
-        "username_length": "username length",
-        "name": "name",
-        "username": "username",
-        "created_at": "creation date"
-    }
+_SORT_LABELS = {
+    "name_length": "name length",
+    "username_length": "username length",
+    "name": "name",
+    "username": "username",
+    "created_at": "creation date",
+}
+
+# (desc label, asc label) per sort field
+_ORDER_LABELS = {
+    "name": ("Z-A", "A-Z"),
+    "username": ("Z-A", "A-Z"),
+    "created_at": ("newest first", "oldest first"),
+    "name_length": ("longest first", "shortest first"),
+    "username_length": ("longest first", "shortest first"),
+}
+
+# Every (sort_by, sort_order) pair -> its label, precomputed at import
+_SORT_LABEL_TABLE = {
+    (sort_by, sort_order): f"{_SORT_LABELS[sort_by]} ({order_label})"
+    for sort_by, (desc_label, asc_label) in _ORDER_LABELS.items()
+    for sort_order, order_label in (("desc", desc_label), ("asc", asc_label))
+}
+
 
-    if sort_by in ["name", "username"]:
-        order_label = "Z-A" if sort_order == "desc" else "A-Z"
-    elif sort_by == "created_at":
-        order_label = "newest first" if sort_order == "desc" else "oldest first"
-    else:
-        order_label = "longest first" if sort_order == "desc" else "shortest first"
+_PARITY_LABELS = {
+    "odd": "odd number of letters",
+    "even": "even number of letters",
+}
 
-    return f"{sort_labels.get(sort_by, sort_by)} ({order_label})"
+
+def _format_sort_label(sort_by: str, sort_order: str) -> str:
+    """Format sort criteria into human-readable label."""
+    return _SORT_LABEL_TABLE.get((sort_by, sort_order), sort_by)
 
 
 def build_filters_applied(filters: UserQueryFilters) -> Optional[dict]:
@@ -197,7 +227,8 @@ def build_filters_applied(filters: UserQueryFilters) -> Optional[dict]:
         filters_applied[key] = filters.name_substr
 
     if filters.name_length_parity:
-        filters_applied["name_length"] = f"{filters.name_length_parity} number of letters"
+        parity = filters.name_length_parity
+        filters_applied["name_length"] = _PARITY_LABELS.get(parity, f"{parity} number of letters")
 
     if filters.has_profile_pic is True:
         filters_applied["profile_picture"] = "has profile picture"
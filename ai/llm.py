@@ -3,7 +3,7 @@ ai/llm.py - LLM Integration for AI-Powered Search
 
 This module handles all communication with the Ollama LLM API:
 - Persistent HTTP client with connection pooling
-- Chat completion for query parsing
+- Chat completion for query parsing (optionally in Ollama JSON mode)
 
 Performance Optimization:
     The module uses a persistent HTTP client to avoid TCP/TLS handshake
@@ -16,6 +16,7 @@ import logging
 from typing import Optional
 
 import httpx
+import orjson
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
@@ -30,6 +31,14 @@ OLLAMA_API_KEY = os.getenv("OLLAMA_API_KEY")
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL")
 
+# Chat endpoint and auth header are fixed for the lifetime of the process,
+# so build them once instead of on every request
+_CHAT_URL = f"{OLLAMA_BASE_URL.rstrip('/')}/api/chat" if OLLAMA_BASE_URL else None
+_AUTH_HEADERS = {"Authorization": f"Bearer {OLLAMA_API_KEY}"}
+
+# Qwen3 <think>...</think> reasoning blocks (compiled once at import)
+_THINK_BLOCK_RE = re.compile(r"<think>[\s\S]*?</think>")
+
 # ==============================================================================
 # PERSISTENT HTTP CLIENT
 # ==============================================================================
@@ -39,7 +48,10 @@ OLLAMA_MODEL = os.getenv("OLLAMA_MODEL")
 #   2. TLS negotiation adds another ~50-100ms
 #
 # By reusing a single persistent client, we skip connection setup
-# for subsequent requests, saving ~100-200ms per request.
+# for subsequent requests, saving ~100-200ms per request. HTTP/2 is
+# negotiated when the Ollama endpoint supports it (TLS), letting
+# concurrent searches share one connection instead of queueing for
+# a free slot in the pool.
 
 _http_client: Optional[httpx.AsyncClient] = None
 
@@ -55,6 +67,8 @@ def get_http_client() -> httpx.AsyncClient:
         - timeout: 60s total, 10s for connection
         - max_keepalive_connections: 5
         - max_connections: 10
+        - http2: enabled (falls back to HTTP/1.1 if unsupported)
+        - Authorization header set once on the client
 
     Returns:
         httpx.AsyncClient: Configured async HTTP client
@@ -64,6 +78,8 @@ def get_http_client() -> httpx.AsyncClient:
         _http_client = httpx.AsyncClient(
             timeout=httpx.Timeout(60.0, connect=10.0),
             limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
+            headers=_AUTH_HEADERS,
+            http2=True,
         )
     return _http_client
 
@@ -108,29 +124,19 @@ async def warmup_model() -> bool:
 # ==============================================================================
 
 
-async def chat_completion(user_input: str, system_prompt: Optional[str] = None) -> str:
-    """
-    Send a request to the Ollama API for chat completion.
-
-    Args:
-        user_input: User's message
-        system_prompt: Optional system prompt for context
+def strip_think_blocks(text: str) -> str:
+    """Remove <think> blocks; a plain substring check skips the regex when there are none."""
+    if "<think>" not in text:
+        return text
+    return _THINK_BLOCK_RE.sub("", text)
 
-    Returns:
-        str: AI's response
-
-    Raises:
-        RuntimeError: If API configuration is missing or request fails
-    """
-    if not OLLAMA_BASE_URL or not OLLAMA_API_KEY:
-        raise RuntimeError("OLLAMA_BASE_URL and OLLAMA_API_KEY must be set in .env")
-
-    url = f"{OLLAMA_BASE_URL.rstrip('/')}/api/chat"
-    headers = {
-        "Authorization": f"Bearer {OLLAMA_API_KEY}",
-        "Content-Type": "application/json",
-    }
 
+def _build_chat_payload(
+        user_input: str,
+        system_prompt: Optional[str],
+        json_format: bool = False
+) -> dict:
+    """Build the request body for Ollama's native /api/chat endpoint."""
     messages = []
     if system_prompt:
         messages.append({"role": "system", "content": system_prompt})
@@ -147,14 +153,44 @@ async def chat_completion(user_input: str, system_prompt: Optional[str] = None)
         },
         "keep_alive": "10m",  # Keep model in memory to avoid reload latency
     }
+    if json_format:
+        # Constrain decoding to valid JSON (no fences or prose around it)
+        payload["format"] = "json"
+    return payload
+
+
+async def chat_completion(
+        user_input: str,
+        system_prompt: Optional[str] = None,
+        json_format: bool = False
+) -> str:
+    """
+    Send a request to the Ollama API for chat completion.
+
+    Args:
+        user_input: User's message
+        system_prompt: Optional system prompt for context
+        json_format: Use Ollama's JSON mode so the reply is a bare JSON object
+
+    Returns:
+        str: AI's response
+
+    Raises:
+        RuntimeError: If API configuration is missing or request fails
+    """
+    if not OLLAMA_BASE_URL or not OLLAMA_API_KEY:
+        raise RuntimeError("OLLAMA_BASE_URL and OLLAMA_API_KEY must be set in .env")
+
+    payload = _build_chat_payload(user_input, system_prompt, json_format)
 
     client = get_http_client()
-    response = await client.post(url, headers=headers, json=payload)
+    response = await client.post(_CHAT_URL, json=payload)
     response.raise_for_status()
-    data = response.json()
+    data = orjson.loads(response.content)
     content = data["message"]["content"]
 
     # Strip Qwen3 <think>...</think> blocks if model still emits them
-    content = re.sub(r"<think>[\s\S]*?</think>", "", content).strip()
+    content = strip_think_blocks(content).strip()
 
     return content
+
@@ -8,7 +8,7 @@ This module defines the data structures used throughout the AI search system:
 """
 
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class UserRecord(BaseModel):
@@ -42,7 +42,12 @@ class UserQueryFilters(BaseModel):
         sort_order: Sort direction ("asc" or "desc")
         query_understood: False if query couldn't be meaningfully parsed
         parse_warnings: Warnings about unsupported features
+
+    Instances are frozen so a parsed result can be shared from the query
+    cache without defensive copies.
     """
+    model_config = ConfigDict(frozen=True)
+
     gender: Optional[str] = None
     name_substr: Optional[str] = None
     starts_with_mode: bool = False
@@ -51,7 +56,7 @@ class UserQueryFilters(BaseModel):
     sort_by: Optional[str] = None  # "name_length", "username_length", "name", "username", "created_at"
     sort_order: str = "desc"  # "asc" or "desc"
     query_understood: bool = True
-    parse_warnings: list = []
+    parse_warnings: list = Field(default_factory=list)
 
 
 class FilteredResult(BaseModel):
@@ -71,5 +76,5 @@ class FilteredResult(BaseModel):
     results: List[UserRecord]
     total_count: int = 0
     query_understood: bool = True
-    parse_warnings: list = []
+    parse_warnings: list = Field(default_factory=list)
     filters_applied: Optional[dict] = None
@@ -1,25 +1,47 @@
 """
-ai/query_parser.py - AI-Only Query Parsing
+ai/query_parser.py - AI Query Parsing
 
-This module handles query parsing using AI (LLM) exclusively.
-All queries are sent to the Ollama LLM for parsing into structured filters.
+This module parses natural language queries into structured filters.
+Queries are sent to the Ollama LLM for parsing, except bare names
+("Adam", "J"), which are answered directly. Successful parses are cached
+so repeated queries skip the AI call.
 """
 
-import json
+import asyncio
+import functools
 import logging
 import re
 from typing import Optional
 
 import httpx
+import orjson
 
 from ai.models import UserQueryFilters
-from ai.llm import chat_completion, OLLAMA_MODEL
+from ai.cache import get_cached_query, cache_query
+from ai.llm import chat_completion, strip_think_blocks, OLLAMA_MODEL
 
 logger = logging.getLogger(__name__)
 
 # Constant for fallback message
 FALLBACK_EMPTY_FILTER_MSG = "Falling back to empty filter"
 
+# Filters are frozen, so the empty result and the fallbacks returned when
+# the AI fails are built once and shared instead of re-validated per call
+_EMPTY_FILTERS = UserQueryFilters()
+
+
+def _fallback_filters(warning: str) -> UserQueryFilters:
+    """Build the show-all-users filters returned when AI parsing fails."""
+    return _EMPTY_FILTERS.model_copy(
+        update={"query_understood": False, "parse_warnings": [f"{warning} - showing all users"]}
+    )
+
+
+_TIMEOUT_FILTERS = _fallback_filters("AI request timed out")
+_SERVICE_ERROR_FILTERS = _fallback_filters("AI service error")
+_INVALID_JSON_FILTERS = _fallback_filters("Could not parse AI response")
+_PARSE_FAILED_FILTERS = _fallback_filters("Query parsing failed")
+
 # Common gender typos -> corrected word (applied before sending to AI)
 _GENDER_TYPOS = {
     "fmale": "female",
@@ -32,6 +54,123 @@ _GENDER_TYPOS = {
     "maile": "male",
 }
 
+# All typos as one alternation, so correction is a single regex pass
+_GENDER_TYPO_RE = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, _GENDER_TYPOS)) + r")\b",
+    re.IGNORECASE,
+)
+
+# Canonical field values. Validators return these shared constants instead
+# of the freshly stripped/lowercased copy of the AI's string, so every
+# parsed filter reuses the same few string objects.
+_GENDER_VALUES = {"male": "Male", "female": "Female", "other": "Other"}
+_SORT_BY_VALUES = {
+    value: value
+    for value in ("name_length", "username_length", "name", "username", "created_at")
+}
+_SORT_ORDER_VALUES = {"asc": "asc", "desc": "desc"}
+_PARITY_VALUES = {"odd": "odd", "even": "even"}
+
+# Words the AI sometimes returns as name_substr that are not actual names
+_INVALID_NAME_SUBSTRS = frozenset({
+    "male", "female", "other", "fmale", "femal", "non-binary", "nonbinary",
+    "user", "users", "all", "null", "none", "",
+    "newest", "oldest", "longest", "shortest", "alphabetical", "sorted",
+    "recent", "latest", "first", "last",
+    "profile", "picture", "photo", "avatar", "pic",
+    "with", "without", "ends", "order",
+})
+
+
+def _with_plurals(words) -> set:
+    """Return the words plus the regular plural of each."""
+    forms = set(words)
+    for word in words:
+        if word.endswith("y") and word[-2:-1] not in "aeiou":
+            forms.add(word[:-1] + "ies")
+        elif word.endswith(("s", "x", "ch", "sh")):
+            forms.add(word + "es")
+        else:
+            forms.add(word + "s")
+    return forms
+
+
+# Single words that describe users rather than name them. Only
+# capitalised words and single letters can skip the AI as bare names (see
+# _parse_single_name); this set keeps common keywords typed with a
+# capital ("Women", "Newest") on the AI path. Nouns are listed in the
+# singular and get their plurals added.
+_NON_NAME_WORDS = frozenset(
+    _INVALID_NAME_SUBSTRS
+    | set(_GENDER_TYPOS)
+    | _with_plurals({
+        # People and genders
+        "male", "female", "woman", "guy", "gal", "lady", "gentleman", "boy",
+        "girl", "dude", "bro", "chick", "lad", "lass", "gent", "person",
+        "folk", "member", "account", "user", "other", "nonbinary", "enby",
+        # Profile pictures
+        "profile", "picture", "pic", "photo", "photograph", "avatar", "image",
+        "headshot", "selfie", "pfp",
+        # Fields and sorting
+        "name", "username", "letter", "character", "length", "order", "sort",
+        "result", "list",
+    })
+    | {
+        # Irregular plurals
+        "man", "men", "women", "gentlemen", "people", "nb",
+        # Sort and order terms
+        "new", "newer", "newest", "old", "older", "oldest",
+        "young", "younger", "youngest", "early", "earlier", "earliest",
+        "late", "later", "latest", "recent", "recently",
+        "long", "longer", "longest", "short", "shorter", "shortest",
+        "big", "bigger", "biggest", "small", "smaller", "smallest",
+        "large", "larger", "largest",
+        "alphabetic", "alphabetical", "alphabetically", "sorted", "sorting",
+        "ordered", "ascending", "descending", "asc", "desc", "reverse",
+        "reversed", "first", "last", "top", "bottom", "odd", "even",
+        # Commands and filler
+        "all", "any", "anyone", "anybody", "everyone", "everybody", "every",
+        "only", "show", "find", "search", "get", "display", "give", "me",
+        "my", "the", "no", "has", "have", "having", "named", "called",
+        "starts", "starting", "begins", "beginning", "ending", "contains",
+        "containing",
+    }
+)
+
+# String spellings of booleans accepted from the AI
+_TRUE_LITERALS = frozenset({"true", "1", "yes"})
+_FALSE_LITERALS = frozenset({"false", "0", "no"})
+
+# Content between the first and last markdown fence (optional json tag)
+_FENCED_BLOCK_RE = re.compile(r"```(?:json)?(.*)```", re.DOTALL)
+
+# First '{' through last '}' of the AI response (the JSON object)
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# Markdown fences and prefixes the model sometimes wraps the JSON in
+_RESPONSE_WRAPPER_RE = re.compile(
+    r"^(?:```(?:json)?|(?:output|response|json|result|answer):)\s*|\s*```$",
+    re.IGNORECASE,
+)
+
+
+# ==============================================================================
+# QUERY NORMALIZATION
+# ==============================================================================
+
+
+@functools.lru_cache(maxsize=1024)
+def _normalize_query(user_query: str) -> str:
+    """
+    Fix common gender typos before the query is sent to the AI.
+
+    Whitespace runs are collapsed to single spaces and every known typo
+    is replaced in one pass of a precompiled regex. Memoized: repeated
+    searches (pagination, refreshes) reuse the previous result.
+    """
+    collapsed = " ".join(user_query.split())
+    return _GENDER_TYPO_RE.sub(lambda m: _GENDER_TYPOS[m.group(0).lower()], collapsed)
+
 
 # ==============================================================================
 # AI RESPONSE VALIDATION
@@ -43,42 +182,45 @@ def _extract_json_from_response(response: str) -> str:
     result = response.strip()
 
     # Strip Qwen3 <think>...</think> blocks if present
-    result = re.sub(r"<think>[\s\S]*?</think>", "", result).strip()
+    result = strip_think_blocks(result).strip()
 
-    # Remove markdown code blocks
+    # Look only inside a fenced block, so braces in text after the closing
+    # fence can't extend the match
     if "```" in result:
-        start = result.find("```")
-        end = result.rfind("```")
-        if start != end:
-            content = result[start + 3:end]
-            if content.startswith("json"):
-                content = content[4:]
-            result = content.strip()
+        fenced = _FENCED_BLOCK_RE.search(result)
+        if fenced:
+            result = fenced.group(1).strip()
 
-    # Remove common prefixes
-    prefixes = ["output:", "response:", "json:", "result:", "answer:"]
-    for prefix in prefixes:
-        if result.lower().startswith(prefix):
-            result = result[len(prefix):].strip()
+    # Outermost {...} span; prefixes fall outside it
+    match = _JSON_OBJECT_RE.search(result)
+    if match:
+        return match.group(0)
 
-    # Extract JSON object
-    start_idx = result.find('{')
-    end_idx = result.rfind('}')
-    if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
-        result = result[start_idx:end_idx + 1]
+    # No object found: drop fences and prefixes so the error log shows the payload
+    return _RESPONSE_WRAPPER_RE.sub("", result).strip()
 
-    return result
 
-
-def _validate_gender(value) -> Optional[str]:
-    """Validate and normalize gender field."""
+def _normalize_token(value) -> Optional[str]:
+    """Strip and lowercase a string field value; None for non-strings."""
     if not isinstance(value, str):
         return None
-    normalized = value.strip().capitalize()
-    if normalized not in ["Male", "Female", "Other"]:
-        logger.warning(f"Invalid gender: {normalized}, setting to null")
+    return value.strip().lower()
+
+
+def _validate_choice(value, choices: dict, field: str) -> Optional[str]:
+    """Map a string field onto its canonical value, or None if not a valid choice."""
+    normalized = _normalize_token(value)
+    if normalized is None:
         return None
-    return normalized
+    canonical = choices.get(normalized)
+    if canonical is None:
+        logger.warning("Invalid %s: %s, setting to null", field, normalized)
+    return canonical
+
+
+def _validate_gender(value) -> Optional[str]:
+    """Validate and normalize gender field."""
+    return _validate_choice(value, _GENDER_VALUES, "gender")
 
 
 def _validate_name_substr(value) -> Optional[str]:
@@ -87,15 +229,7 @@ def _validate_name_substr(value) -> Optional[str]:
         return None
     cleaned = value.strip().strip("'\"[]")
     # Filter out words that are not actual names
-    invalid_values = {
-        "male", "female", "other", "fmale", "femal", "non-binary", "nonbinary",
-        "user", "users", "all", "null", "none", "",
-        "newest", "oldest", "longest", "shortest", "alphabetical", "sorted",
-        "recent", "latest", "first", "last",
-        "profile", "picture", "photo", "avatar", "pic",
-        "with", "without", "ends", "order",
-    }
-    if cleaned.lower() in invalid_values:
+    if cleaned.lower() in _INVALID_NAME_SUBSTRS:
         return None
     return cleaned if cleaned else None
 
@@ -104,76 +238,78 @@ def _validate_boolean_field(value) -> Optional[bool]:
     """Convert string boolean to actual boolean."""
     if isinstance(value, bool):
         return value
-    if isinstance(value, str):
-        lower = value.strip().lower()
-        if lower in ["true", "1", "yes"]:
-            return True
-        if lower in ["false", "0", "no"]:
-            return False
+    lower = _normalize_token(value)
+    if lower in _TRUE_LITERALS:
+        return True
+    if lower in _FALSE_LITERALS:
+        return False
     return None
 
 
 def _validate_sort_by(value) -> Optional[str]:
     """Validate sort_by field."""
-    if not isinstance(value, str):
-        return None
-    normalized = value.strip().lower()
-    valid_sorts = ["name_length", "username_length", "name", "username", "created_at"]
-    if normalized not in valid_sorts:
-        logger.warning(f"Invalid sort_by: {normalized}, setting to null")
-        return None
-    return normalized
+    return _validate_choice(value, _SORT_BY_VALUES, "sort_by")
 
 
 def _validate_sort_order(value) -> str:
     """Validate sort_order field, defaulting to 'desc'."""
-    if isinstance(value, str):
-        normalized = value.strip().lower()
-        if normalized in ["asc", "desc"]:
-            return normalized
-    return "desc"
+    return _SORT_ORDER_VALUES.get(_normalize_token(value), "desc")
 
 
 def _validate_parity(value) -> Optional[str]:
     """Validate name_length_parity field."""
-    if not isinstance(value, str):
-        return None
-    normalized = value.strip().lower()
-    if normalized not in ["odd", "even"]:
-        logger.warning(f"Invalid name_length_parity: {normalized}, setting to null")
-        return None
-    return normalized
+    return _validate_choice(value, _PARITY_VALUES, "name_length_parity")
 
 
-def _sanitize_ai_response(parsed_dict: dict) -> dict:
-    """Validate and sanitize all fields in the parsed AI response."""
-    if "gender" in parsed_dict:
-        parsed_dict["gender"] = _validate_gender(parsed_dict["gender"])
+def _validate_starts_with_mode(value) -> bool:
+    """Validate starts_with_mode field, defaulting to False."""
+    result = _validate_boolean_field(value)
+    return result if result is not None else False
 
-    if "name_substr" in parsed_dict:
-        parsed_dict["name_substr"] = _validate_name_substr(parsed_dict["name_substr"])
 
-    if "starts_with_mode" in parsed_dict:
-        result = _validate_boolean_field(parsed_dict["starts_with_mode"])
-        parsed_dict["starts_with_mode"] = result if result is not None else False
+# Field name -> validator, applied to every key present in the AI response
+_FIELD_VALIDATORS = {
+    "gender": _validate_gender,
+    "name_substr": _validate_name_substr,
+    "starts_with_mode": _validate_starts_with_mode,
+    "name_length_parity": _validate_parity,
+    "has_profile_pic": _validate_boolean_field,
+    "sort_by": _validate_sort_by,
+    "sort_order": _validate_sort_order,
+}
 
-    if "name_length_parity" in parsed_dict:
-        parsed_dict["name_length_parity"] = _validate_parity(parsed_dict["name_length_parity"])
 
-    if "has_profile_pic" in parsed_dict:
-        parsed_dict["has_profile_pic"] = _validate_boolean_field(parsed_dict["has_profile_pic"])
+def _sanitize_ai_response(parsed_dict: dict) -> dict:
+    """Validate and sanitize all fields in the parsed AI response."""
+    for field, validator in _FIELD_VALIDATORS.items():
+        if field in parsed_dict:
+            parsed_dict[field] = validator(parsed_dict[field])
 
-    if "sort_by" in parsed_dict:
-        parsed_dict["sort_by"] = _validate_sort_by(parsed_dict["sort_by"])
+    return parsed_dict
 
-    if "sort_order" in parsed_dict:
-        parsed_dict["sort_order"] = _validate_sort_order(parsed_dict["sort_order"])
 
-    return parsed_dict
+def _parse_single_name(user_query: str) -> Optional[UserQueryFilters]:
+    """
+    Parse a bare name ("Adam", "J") without calling the AI.
+
+    Only a single letter or a single capitalised word that is not a
+    descriptive keyword counts as a bare name. Other lowercase words may be
+    synonyms or slang ("gents", "pfp") that only the AI can interpret.
+
+    Returns:
+        UserQueryFilters with name_substr set, or None if the query needs the AI
+    """
+    if not user_query.isalpha():
+        return None
+    if len(user_query) > 1 and not user_query.istitle():
+        return None
+    if user_query.lower() in _NON_NAME_WORDS:
+        return None
+    return UserQueryFilters(name_substr=user_query)
 
 
 # ==============================================================================
-# SYSTEM PROMPT FOR AI
+# PROMPTS FOR AI
 # ==============================================================================
 
 SYSTEM_PROMPT = """Output ONLY valid JSON. No other text.
@@ -199,17 +335,26 @@ Examples:
 "w/ pics" -> {"gender":null,"name_substr":null,"starts_with_mode":false,"name_length_parity":null,"has_profile_pic":true,"sort_by":null,"sort_order":"desc"}
 "w/o avatar" -> {"gender":null,"name_substr":null,"starts_with_mode":false,"name_length_parity":null,"has_profile_pic":false,"sort_by":null,"sort_order":"desc"}"""
 
+# User message: the quoted query followed by a JSON cue (schema lives in SYSTEM_PROMPT)
+USER_PROMPT_TEMPLATE = '"{query}"\nJSON:'
+
 
 # ==============================================================================
 # MAIN AI PARSING FUNCTION
 # ==============================================================================
 
+# AI parses currently running, keyed by normalized query
+_inflight_parses: "dict[str, asyncio.Future]" = {}
+
 
 async def parse_query_ai(user_query: str) -> UserQueryFilters:
     """
     Parse user query into structured filters using AI.
 
-    All queries are sent directly to the LLM for parsing.
+    Single-word name queries are answered directly; everything else is
+    sent to the LLM for parsing. Successful parses are cached by normalized
+    query so repeated searches skip the AI call, and identical queries
+    arriving while a parse is running wait for that parse.
 
     Args:
         user_query: Natural language search query
@@ -217,71 +362,103 @@ async def parse_query_ai(user_query: str) -> UserQueryFilters:
     Returns:
         UserQueryFilters: Parsed query filters
     """
-    user_query = user_query.strip()
+    # Cache keys are normalized queries, so input that is already in
+    # normal form (the common case) hits without any string processing
+    cached = get_cached_query(user_query)
+    if cached is None:
+        # Collapse whitespace and fix common gender typos before sending to AI
+        user_query = _normalize_query(user_query)
+
+        # Handle empty query
+        if not user_query:
+            logger.warning("Empty query received")
+            return _EMPTY_FILTERS
+
+        cached = get_cached_query(user_query)
+
+    # Reuse a previous parse of the same query (skips the AI round-trip)
+    if cached is not None:
+        logger.debug("Cache hit for query: '%s'", user_query)
+        return cached
+
+    # Bare names ("Adam", "J") don't need model inference
+    result = _parse_single_name(user_query)
+    if result is not None:
+        logger.debug("Parsed single-word name query without AI: '%s'", user_query)
+        cache_query(user_query, result)
+        return result
 
-    # Handle empty query
-    if not user_query:
-        logger.warning("Empty query received")
-        return UserQueryFilters()
+    # Concurrent requests for the same uncached query share one AI call.
+    # shield() keeps a disconnecting client from cancelling the parse the
+    # other waiters depend on.
+    task = _inflight_parses.get(user_query)
+    if task is None:
+        task = asyncio.ensure_future(_parse_with_ai(user_query))
+        _inflight_parses[user_query] = task
+        task.add_done_callback(lambda _: _inflight_parses.pop(user_query, None))
+    else:
+        logger.debug("Joining in-flight AI parse for query: '%s'", user_query)
 
-    # Fix common gender typos before sending to AI
-    words = user_query.split()
-    corrected_words = [_GENDER_TYPOS.get(w.lower(), w) for w in words]
-    user_query = " ".join(corrected_words)
+    return await asyncio.shield(task)
 
-    logger.info(f"Parsing query with AI: '{user_query}'")
+
+async def _parse_with_ai(user_query: str) -> UserQueryFilters:
+    """
+    Send a normalized query to the LLM and cache the parsed filters.
+
+    Never raises for AI or parse failures; a show-all-users fallback with
+    a warning is returned instead (and not cached).
+
+    Args:
+        user_query: Normalized search query
+
+    Returns:
+        UserQueryFilters: Parsed query filters
+    """
+    logger.info("Parsing query with AI: '%s'", user_query)
 
     try:
-        user_prompt = f""""{user_query}"
-JSON:"""
+        user_prompt = USER_PROMPT_TEMPLATE.format(query=user_query)
 
-        logger.info(f"Calling AI model: {OLLAMA_MODEL}")
-        parsed_json = await chat_completion(user_prompt, SYSTEM_PROMPT)
+        logger.debug("Calling AI model: %s", OLLAMA_MODEL)
+        parsed_json = await chat_completion(user_prompt, SYSTEM_PROMPT, json_format=True)
 
-        logger.info(f"Raw AI response: {parsed_json}")
+        logger.debug("Raw AI response: %s", parsed_json)
 
         # Extract and clean JSON
         cleaned_json = _extract_json_from_response(parsed_json)
-        logger.info(f"Cleaned JSON: {cleaned_json}")
+        logger.debug("Cleaned JSON: %s", cleaned_json)
 
         # Parse and sanitize
-        parsed_dict = json.loads(cleaned_json)
+        parsed_dict = orjson.loads(cleaned_json)
         parsed_dict = _sanitize_ai_response(parsed_dict)
 
         result = UserQueryFilters(**parsed_dict)
 
-        logger.info(f"AI parse successful: {result.model_dump()}")
+        # model_dump() builds a dict, so only pay for it when debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("AI parse successful: %s", result.model_dump())
+
+        cache_query(user_query, result)
 
         return result
 
     except httpx.ReadTimeout as exc:
-        logger.error(f"AI request timed out: {exc}")
+        logger.error("AI request timed out: %s", exc)
         logger.warning(FALLBACK_EMPTY_FILTER_MSG)
-        result = UserQueryFilters()
-        result.query_understood = False
-        result.parse_warnings.append("AI request timed out - showing all users")
-        return result
+        return _TIMEOUT_FILTERS
 
     except httpx.HTTPError as exc:
-        logger.error(f"HTTP error calling AI: {exc}")
+        logger.error("HTTP error calling AI: %s", exc)
         logger.warning(FALLBACK_EMPTY_FILTER_MSG)
-        result = UserQueryFilters()
-        result.query_understood = False
-        result.parse_warnings.append("AI service error - showing all users")
-        return result
+        return _SERVICE_ERROR_FILTERS
 
-    except json.JSONDecodeError as exc:
-        logger.error(f"Invalid JSON from AI: {exc}")
+    except orjson.JSONDecodeError as exc:
+        logger.error("Invalid JSON from AI: %s", exc)
         logger.warning(FALLBACK_EMPTY_FILTER_MSG)
-        result = UserQueryFilters()
-        result.query_understood = False
-        result.parse_warnings.append("Could not parse AI response - showing all users")
-        return result
+        return _INVALID_JSON_FILTERS
 
     except Exception as exc:
-        logger.error(f"Unexpected error in AI parsing: {type(exc).__name__}: {exc}")
+        logger.error("Unexpected error in AI parsing: %s: %s", type(exc).__name__, exc)
         logger.warning(FALLBACK_EMPTY_FILTER_MSG)
-        result = UserQueryFilters()
-        result.query_understood = False
-        result.parse_warnings.append("Query parsing failed - showing all users")
-        return result
+        return _PARSE_FAILED_FILTERS
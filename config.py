@@ -9,6 +9,7 @@ Centralized configuration for the FastAPI application including:
 """
 
 import os
+import re
 import logging
 from pathlib import Path
 
@@ -53,6 +54,9 @@ ALLOWED_MIME_TYPES = [
 
 VALID_GENDERS = ["Male", "Female", "Other"]
 
+# Username characters: letters, digits and underscore (compiled once)
+USERNAME_RE = re.compile(r'\w+')
+
 # ==============================================================================
 # ERROR MESSAGES
 # ==============================================================================
@@ -253,19 +253,3 @@ def get_pool_stats() -> dict:
         "overflow": pool.overflow(),
         "total_connections": pool.size() + pool.overflow()
     }
-
-
-# ==============================================================================
-# STARTUP VALIDATION
-# ==============================================================================
-
-# Verify database connection on import
-try:
-    if check_database_health():
-        print("[OK] Database connection successful!")
-    else:
-        print("[WARN] Warning: Database health check failed")
-        print("   Make sure PostgreSQL is running and credentials are correct")
-except Exception as e:
-    print(f"[WARN] Warning: Could not verify database connection: {e}")
-    print("   The application may not work correctly")
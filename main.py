@@ -19,6 +19,7 @@ Architecture:
 
 import os
 import time
+import asyncio
 import logging
 
 from fastapi import FastAPI, Request
@@ -69,17 +70,21 @@ async def log_requests(request: Request, call_next):
     start_time = time.time()
 
     logger.info(
-        f"{request.method} {request.url.path} "
-        f"from {request.client.host if request.client else 'unknown'}"
+        "%s %s from %s",
+        request.method,
+        request.url.path,
+        request.client.host if request.client else "unknown",
     )
 
     response = await call_next(request)
 
     process_time = time.time() - start_time
     logger.info(
-        f"{request.method} {request.url.path} "
-        f"completed in {process_time:.3f}s "
-        f"with status {response.status_code}"
+        "%s %s completed in %.3fs with status %d",
+        request.method,
+        request.url.path,
+        process_time,
+        response.status_code,
     )
 
     response.headers["X-Process-Time"] = str(process_time)
@@ -161,10 +166,21 @@ async def startup_event():
     logger.info(f"Environment: {ENVIRONMENT}")
     logger.info(f"Upload directory: {UPLOAD_DIR.absolute()}")
 
-    if check_database_health():
+    # The check opens a blocking connection, so keep it off the event loop
+    if await asyncio.to_thread(check_database_health):
         logger.info("Database connection verified")
     else:
-        logger.warning("Database health check failed")
+        logger.warning(
+            "Database health check failed - make sure PostgreSQL is running "
+            "and credentials are correct"
+        )
+
+    # Add columns/indexes missing from an existing users table (blocking DDL,
+    # so also off the event loop)
+    try:
+        await asyncio.to_thread(models.upgrade_schema, engine)
+    except Exception as exc:
+        logger.error(f"Schema upgrade failed - see MIGRATION NOTES in models.py: {exc}")
 
     # Warm up AI model (loads weights into memory, avoids cold-start on first request)
     await warmup_model()
@@ -18,8 +18,17 @@ Database Indexes:
     - idx_user_username: Unique index for fast username lookups
     - idx_user_gender: Index for gender filtering (AI search)
     - idx_user_fullname: Index for name searches
+    - idx_user_fullname_trgm: pg_trgm GIN index for case-insensitive
+      substring/prefix name search (ILIKE) in AI search. Created by
+      upgrade_schema() rather than create_all(), and skipped when the
+      database role cannot create the pg_trgm extension
     - idx_user_gender_name: Composite index for combined gender + name queries
     - idx_user_created: Index for sorting by creation date
+    - idx_user_name_length: Index on the generated name_length column
+      (AI search name-length sorting; odd/even filters read the stored
+      column but can't use the index)
+    - idx_user_username_length: Expression index on length(username)
+      (AI search username-length sorting)
 
 Validation:
     Model-level validation catches invalid data before it reaches the database:
@@ -33,11 +42,16 @@ Migration Notes:
     MIGRATION NOTES section at the bottom of this file for SQL commands.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Index, event, CheckConstraint
+import logging  # Schema upgrade warnings
+
+from sqlalchemy import Column, Integer, String, DateTime, Index, event, CheckConstraint, Computed, inspect, text
+from sqlalchemy.exc import SQLAlchemyError  # Failed upgrade statements
 from sqlalchemy.sql import func  # SQL functions like NOW()
-from sqlalchemy.orm import validates  # Validator decorator
+from sqlalchemy.orm import validates, deferred  # Validator decorator, lazy column loading
 from database import Base  # SQLAlchemy declarative base
-import re  # Regular expressions for validation
+from config import VALID_GENDERS, USERNAME_RE  # Allowed genders, username characters
+
+logger = logging.getLogger(__name__)
 
 
 # ==============================================================================
@@ -62,6 +76,7 @@ class User(Base):
         password (str): Hashed password (Argon2 hash, ~90 characters)
         gender (str): User gender - must be 'Male', 'Female', or 'Other'
         profile_pic (str): Optional path to profile picture file
+        name_length (int): Letters in full_name excluding spaces (generated by PostgreSQL)
         created_at (datetime): Timestamp when user was created
         updated_at (datetime): Timestamp when user was last updated
     """
@@ -108,6 +123,17 @@ class User(Base):
         comment="Path to profile picture file"
     )
 
+    # Generated column - computed and stored by PostgreSQL whenever
+    # full_name changes, so AI search can filter/sort on name length
+    # without evaluating length(replace(...)) for every row. Deferred so
+    # ordinary user loads don't select it (and keep working on databases
+    # that haven't been upgraded yet)
+    name_length = deferred(Column(
+        Integer,
+        Computed("length(replace(full_name, ' ', ''))", persisted=True),
+        comment="Number of letters in full_name (spaces excluded)"
+    ))
+
     # Timestamps - automatically managed
     created_at = Column(
         DateTime(timezone=True),
@@ -135,6 +161,8 @@ class User(Base):
         Index('idx_user_fullname', 'full_name'),
         Index('idx_user_gender_name', 'gender', 'full_name'),  # Composite index for AI search
         Index('idx_user_created', 'created_at'),
+        Index('idx_user_name_length', 'name_length'),  # Name length sorting
+        Index('idx_user_username_length', func.length(username)),  # Username length sorting
 
         # Check constraint for gender values
         CheckConstraint(
@@ -179,7 +207,7 @@ class User(Base):
             raise ValueError("Username must be at most 50 characters long")
 
         # Check for valid characters (alphanumeric + underscore only)
-        if not re.match(r'^\w+$', username):
+        if not USERNAME_RE.fullmatch(username):
             raise ValueError(
                 "Username can only contain letters, numbers, and underscores. "
                 "No spaces or special characters allowed."
@@ -202,16 +230,14 @@ class User(Base):
         Raises:
             ValueError: If gender is not one of the allowed values
         """
-        valid_genders = ['Male', 'Female', 'Other']
-
         if not gender:
             raise ValueError("Gender is required")
 
         gender = gender.strip()
 
-        if gender not in valid_genders:
+        if gender not in VALID_GENDERS:
             raise ValueError(
-                f"Gender must be one of: {', '.join(valid_genders)}. "
+                f"Gender must be one of: {', '.join(VALID_GENDERS)}. "
                 f"Got: '{gender}'"
             )
 
@@ -304,6 +330,74 @@ class User(Base):
         return data
 
 
+# ==============================================================================
+# SCHEMA UPGRADES
+# ==============================================================================
+
+# create_all() only creates missing tables, so existing users tables get the
+# AI search column and indexes from these idempotent statements instead,
+# keyed by the column or index each one adds
+SCHEMA_UPGRADES = (
+    ("name_length",
+     "ALTER TABLE users ADD COLUMN IF NOT EXISTS name_length INTEGER "
+     "GENERATED ALWAYS AS (length(replace(full_name, ' ', ''))) STORED"),
+    ("idx_user_name_length",
+     "CREATE INDEX IF NOT EXISTS idx_user_name_length ON users (name_length)"),
+    ("idx_user_username_length",
+     "CREATE INDEX IF NOT EXISTS idx_user_username_length ON users (length(username))"),
+)
+
+# Trigram index for ILIKE name search (idx_user_fullname_trgm). pg_trgm
+# needs a role allowed to create extensions, so it is optional: without
+# it name search still works, it just scans the table
+TRIGRAM_INDEX_UPGRADES = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS idx_user_fullname_trgm ON users USING gin (full_name gin_trgm_ops)",
+)
+
+# Advisory lock key serializing upgrades across workers that start together
+_SCHEMA_UPGRADE_LOCK = 7_245_001
+
+
+def _run_upgrade(bind, statements):
+    """Run statements in one transaction, holding the schema upgrade lock."""
+    with bind.begin() as connection:
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _SCHEMA_UPGRADE_LOCK})
+        for statement in statements:
+            connection.execute(text(statement))
+
+
+def upgrade_schema(bind):
+    """
+    Bring an existing users table up to date with the model.
+
+    Safe to run on every startup: only statements whose column or index is
+    missing from the catalog are run, so an up-to-date database takes no
+    table locks. The optional trigram index runs in its own transaction,
+    so failing to create it only logs a warning and leaves the other
+    upgrades in place.
+
+    Args:
+        bind: SQLAlchemy engine to run the statements on
+    """
+    # ALTER TABLE / CREATE INDEX lock users even when IF NOT EXISTS turns
+    # them into no-ops, so check the catalog first
+    inspector = inspect(bind)
+    existing = {column["name"] for column in inspector.get_columns("users")}
+    existing.update(index["name"] for index in inspector.get_indexes("users"))
+
+    pending = [statement for name, statement in SCHEMA_UPGRADES if name not in existing]
+    if pending:
+        _run_upgrade(bind, pending)
+
+    if "idx_user_fullname_trgm" in existing:
+        return
+    try:
+        _run_upgrade(bind, TRIGRAM_INDEX_UPGRADES)
+    except SQLAlchemyError as exc:
+        logger.warning("Skipping idx_user_fullname_trgm, name search will not use an index: %s", exc)
+
+
 # ==============================================================================
 # EVENT LISTENERS
 # ==============================================================================
@@ -369,6 +463,22 @@ with a migration. Here's how to do it manually:
    ALTER TABLE users 
    ADD CONSTRAINT check_gender_valid CHECK (gender IN ('Male', 'Female', 'Other'));
 
+Steps 5-7 are also applied by upgrade_schema() in the startup event
+(step 7 only if the database role may create the pg_trgm extension).
+
+5. Add the generated name_length column and its index:
+   ALTER TABLE users
+   ADD COLUMN name_length INTEGER
+   GENERATED ALWAYS AS (length(replace(full_name, ' ', ''))) STORED;
+   CREATE INDEX idx_user_name_length ON users (name_length);
+
+6. Add the username length expression index:
+   CREATE INDEX idx_user_username_length ON users (length(username));
+
+7. Add the trigram index for AI name search (ILIKE '%name%'):
+   CREATE EXTENSION IF NOT EXISTS pg_trgm;
+   CREATE INDEX idx_user_fullname_trgm ON users USING gin (full_name gin_trgm_ops);
+
 Or use Alembic for automatic migrations:
    alembic revision --autogenerate -m "Add timestamps and constraints"
    alembic upgrade head
@@ -4,6 +4,8 @@ routers/health.py - Health Check and System Status Endpoints
 Endpoints for monitoring application health:
 - GET /: Root endpoint with API info
 - GET /health: Comprehensive health check
+- GET /cache/stats: AI query cache statistics
+- DELETE /cache: Clear the AI query cache
 """
 
 import time
@@ -15,6 +17,7 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
+from ai import clear_cache, get_cache_stats
 from database import get_db, get_pool_stats
 from config import ENVIRONMENT, UPLOAD_DIR
 
@@ -82,3 +85,24 @@ async def health_check(db: Session = Depends(get_db)) -> Dict[str, Any]:
 
     status_code = 200 if health_status["status"] == "healthy" else 503
     return JSONResponse(content=health_status, status_code=status_code)
+
+
+@router.get(
+    "/cache/stats",
+    summary="AI query cache statistics",
+    description="Number of parsed AI search queries held in memory"
+)
+def cache_stats() -> Dict[str, Any]:
+    """Return the size and capacity of the AI query cache"""
+    return get_cache_stats()
+
+
+@router.delete(
+    "/cache",
+    summary="Clear AI query cache",
+    description="Drop all cached AI search parses so queries are re-parsed by the LLM"
+)
+def clear_query_cache() -> Dict[str, Any]:
+    """Clear the AI query cache"""
+    clear_cache()
+    return {"message": "Query cache cleared"}
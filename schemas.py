@@ -39,7 +39,7 @@ Configuration:
 from pydantic import BaseModel, Field, field_validator  # Pydantic v2 components
 from typing import Optional  # Optional type hint
 from datetime import datetime  # Datetime handling
-import re  # Regular expressions for validation
+from config import VALID_GENDERS, USERNAME_RE  # Allowed genders, username characters
 
 
 # ==============================================================================
@@ -59,7 +59,7 @@ class UserBase(BaseModel):
     @classmethod
     def validate_username(cls, v):
         """Validate username format"""
-        if not re.match(r'^\w+$', v):
+        if not USERNAME_RE.fullmatch(v):
             raise ValueError('Username can only contain letters, numbers, and underscores')
         return v.strip()
 
@@ -67,9 +67,8 @@ class UserBase(BaseModel):
     @classmethod
     def validate_gender(cls, v):
         """Validate gender value"""
-        valid_genders = ['Male', 'Female', 'Other']
-        if v not in valid_genders:
-            raise ValueError(f'Gender must be one of: {", ".join(valid_genders)}')
+        if v not in VALID_GENDERS:
+            raise ValueError(f'Gender must be one of: {", ".join(VALID_GENDERS)}')
         return v
 
     @field_validator('full_name')